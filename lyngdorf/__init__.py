@@ -1,3 +1,7 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Automation Library for Lyngdorf receivers.
 
-
-    
\ No newline at end of file
+:license: MIT, see LICENSE for more details.
+"""
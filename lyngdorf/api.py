@@ -7,18 +7,20 @@ Automation Library for Lyngdorf receivers.
 """
 
 import asyncio
-import contextlib
-import time
+import socket
 import logging
-import attr
-import traceback
+import random
+import re
 
 from asyncio import timeout as asyncio_timeout
-from typing import Callable, Dict, Optional, cast, List
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, Iterable, Optional, Tuple, cast
 
 from lyngdorf.const import (
     DEFAULT_LYNGDORF_PORT,
     RECONNECT_BACKOFF, RECONNECT_MAX_WAIT, RECONNECT_SCALE, MONITOR_INTERVAL,
+    KEEP_ALIVE_TIMEOUT, TCP_KEEPALIVE_IDLE, TCP_KEEPALIVE_INTERVAL, TCP_KEEPALIVE_COUNT,
+    RECEIVE_BUFFER_SIZE, MAX_MESSAGE_SIZE, CALLBACK_QUEUE_SIZE,
     Msg, LyngdorfModel
 )
 
@@ -26,17 +28,48 @@ from lyngdorf.const import (
 
 _LOGGER = logging.getLogger(__package__)
 
+# !CMD(first)second, where the bracketed parameter and trailing text are optional
+# and the surrounding quotes of a "second" string are matched off
+_EVENT_RE = re.compile(rb'!([^(]+)(?:\(([^)]*)\)(?:"(.*)"|(.*)))?', re.DOTALL)
 
-class LyngdorfProtocol(asyncio.Protocol):
+# '!COMMAND\r' wire frames by command string, shared by every connection
+_ENC_CACHE: Dict[str, bytes] = {}
+
+
+def _encode_frame(command: str) -> bytes:
+    """Return the encoded '!COMMAND\r' frame for command, building it once."""
+    frame = _ENC_CACHE.get(command)
+    if frame is None:
+        frame = _ENC_CACHE[command] = f"!{command}\r".encode("utf-8")
+    return frame
+
+class LyngdorfProtocol(asyncio.BufferedProtocol):
     """Protocol for the Lyngdorf interface."""
 
+    __slots__ = (
+        "_buffer",
+        "_view",
+        "_read_pos",
+        "_scan_pos",
+        "_write_pos",
+        "_discarding",
+        "transport",
+        "_on_message",
+        "_on_connection_lost",
+    )
+
     def __init__(
         self,
-        on_message: Callable[[str], None],
+        on_message: Callable[[bytes], None],
         on_connection_lost: Callable[[], None],
     ) -> None:
         """Initialize the protocol."""
-        self._buffer = b""
+        self._buffer = bytearray(RECEIVE_BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
+        self._read_pos = 0
+        self._scan_pos = 0
+        self._write_pos = 0
+        self._discarding = False
         self.transport: Optional[asyncio.Transport] = None
         self._on_message = on_message
         self._on_connection_lost = on_connection_lost
@@ -48,11 +81,11 @@ class LyngdorfProtocol(asyncio.Protocol):
             return False
         return not self.transport.is_closing()
 
-    def write(self, data: str) -> None:
+    def write(self, data: bytes) -> None:
         """Write data to the transport."""
         if self.transport is None or self.transport.is_closing():
             return
-        self.transport.write(data.encode("utf-8"))
+        self.transport.write(data)
 
     def close(self) -> None:
         """Close the connection."""
@@ -65,13 +98,63 @@ class LyngdorfProtocol(asyncio.Protocol):
         self._on_connection_lost()
         return True
 
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Return the free tail of the receive buffer for the transport to fill."""
+        if self._write_pos == len(self._buffer):
+            self._make_room()
+        return self._view[self._write_pos :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Handle nbytes written into the receive buffer."""
+        self._write_pos += nbytes
+        # only the newly received bytes can hold a terminator we haven't seen
+        end = self._buffer.find(b"\r", self._scan_pos, self._write_pos)
+        while end >= 0:
+            start, self._read_pos = self._read_pos, end + 1
+            if self._discarding:
+                # the tail of an oversized line
+                self._discarding = False
+            else:
+                self._on_message(bytes(self._view[start:end]))
+            end = self._buffer.find(b"\r", self._read_pos, self._write_pos)
+        if self._read_pos == self._write_pos:
+            self._read_pos = self._scan_pos = self._write_pos = 0
+        else:
+            self._scan_pos = self._write_pos
+
     def data_received(self, data: bytes) -> None:
-        """Handle data received."""
-        self._buffer += data
-        while b"\r" in self._buffer:
-            line, _, self._buffer = self._buffer.partition(b"\r")
-            with contextlib.suppress(UnicodeDecodeError):
-                self._on_message(line.decode("utf-8"))
+        """Feed already received bytes through get_buffer/buffer_updated, eg from tests."""
+        data = memoryview(data)
+        while data:
+            with self.get_buffer(len(data)) as buf:
+                nbytes = min(len(buf), len(data))
+                buf[:nbytes] = data[:nbytes]
+            data = data[nbytes:]
+            self.buffer_updated(nbytes)
+
+    def _make_room(self) -> None:
+        """Move the unread tail to the front of the buffer, growing it if full."""
+        if self._read_pos == 0:
+            # a single unterminated line fills the whole buffer
+            if len(self._buffer) >= MAX_MESSAGE_SIZE:
+                _LOGGER.warning(
+                    "Dropping a message longer than %d bytes", MAX_MESSAGE_SIZE
+                )
+                self._scan_pos = self._write_pos = 0
+                self._discarding = True
+                return
+            # grow into a fresh buffer rather than resizing this one, which the
+            # transport may still hold a slice of from an earlier get_buffer()
+            buffer = bytearray(2 * len(self._buffer))
+            buffer[: self._write_pos] = self._view[: self._write_pos]
+            self._buffer = buffer
+            self._view = memoryview(buffer)
+            return
+        unread = self._write_pos - self._read_pos
+        self._buffer[:unread] = self._buffer[self._read_pos : self._write_pos]
+        self._scan_pos -= self._read_pos
+        self._read_pos = 0
+        self._write_pos = unread
 
     def connection_made(self, transport: asyncio.Transport) -> None:  # type: ignore
         """Handle connection made."""
@@ -85,28 +168,135 @@ class LyngdorfProtocol(asyncio.Protocol):
         return super().connection_lost(exc)
 
 
+# on/off settings that are two separate commands on the wire
+_TOGGLES: Dict[str, Tuple[Msg, Msg]] = {
+    "power": (Msg.POWER_ON, Msg.POWER_OFF),
+    "zone_b_power": (Msg.ZONE_B_POWER_ON, Msg.ZONE_B_POWER_OFF),
+    "mute": (Msg.MUTE_ON, Msg.MUTE_OFF),
+    "zone_b_mute": (Msg.ZONE_B_MUTE_ON, Msg.ZONE_B_MUTE_OFF),
+}
+
+# messages that can be stepped up (+) or down (-) by one notch
+_STEPS: Tuple[Msg, ...] = (
+    Msg.VOLUME,
+    Msg.ZONE_B_VOLUME,
+    Msg.TRIM_BASS,
+    Msg.TRIM_CENTRE,
+    Msg.TRIM_HEIGHT,
+    Msg.TRIM_LFE,
+    Msg.TRIM_SURROUND,
+    Msg.TRIM_TREBLE_SET,
+)
+
+
+def _toggle_command(key: str) -> Callable[["LyngdorfApi", bool], None]:
+    """Build a method switching one of the _TOGGLES on or off."""
+
+    def command(self: "LyngdorfApi", enabled: bool) -> None:
+        self._writeCommand(self._toggle_frames[key, enabled])
+
+    return command
+
+
+def _scaled_command(msg: Msg) -> Callable[["LyngdorfApi", float], None]:
+    """Build a method sending a dB value to the receiver in tenths, eg VOL(-220)."""
+
+    def command(self: "LyngdorfApi", value: float) -> None:
+        self._writeCommand(b"!%s(%.0f)\r" % (self._cmd[msg], value * 10.0))
+
+    return command
+
+
+def _indexed_command(msg: Msg) -> Callable[["LyngdorfApi", int], None]:
+    """Build a method sending an integer argument to the receiver, eg SRC(1)."""
+
+    def command(self: "LyngdorfApi", index: int) -> None:
+        self._writeCommand(b"!%s(%d)\r" % (self._cmd[msg], index))
+
+    return command
+
+
+def _step_command(msg: Msg, direction: str) -> Callable[["LyngdorfApi"], None]:
+    """Build a method stepping one of the _STEPS up (+) or down (-) on the receiver."""
+
+    def command(self: "LyngdorfApi") -> None:
+        self._writeCommand(self._step_frames[msg, direction])
+
+    return command
+
+
 class LyngdorfApi:
     """Handle responses from the Lyngdorf interface."""
 
+    __slots__ = (
+        "host",
+        "timeout",
+        "_model",
+        "_cmd",
+        "_toggle_frames",
+        "_step_frames",
+        "_ping_frame",
+        "_pong_frame",
+        "_setup_payload",
+        "_connection_enabled",
+        "_connect_lock",
+        "_loop",
+        "_healthy",
+        "_last_message_time",
+        "_reconnect_task",
+        "_callback_queue",
+        "_callback_worker",
+        "_keep_alive_task",
+        "_pong_event",
+        "_protocol",
+        "_callbacks",
+        "_notification_callbacks",
+        "_notification_snapshot",
+    )
+
     def __init__(self, host: str, model: LyngdorfModel):
         """Initialize the client."""
         self._connection_enabled = False
         self.host = host
         self._model: LyngdorfModel = model
+        # wire encodings of the model's commands, built once rather than per send,
+        # in tuples indexed by Msg (an IntEnum)
+        self._cmd: Tuple[bytes, ...] = tuple(
+            model.lookup_command(msg).encode("utf-8") for msg in Msg
+        )
+        frames = tuple(_encode_frame(model.lookup_command(msg)) for msg in Msg)
+        self._toggle_frames: Dict[Tuple[str, bool], bytes] = {}
+        for key, (on, off) in _TOGGLES.items():
+            self._toggle_frames[key, True] = frames[on]
+            self._toggle_frames[key, False] = frames[off]
+        self._step_frames: Dict[Tuple[Msg, str], bytes] = {
+            (msg, direction): _encode_frame(model.lookup_command(msg) + direction)
+            for msg in _STEPS
+            for direction in "+-"
+        }
+        self._ping_frame = _encode_frame(model.lookup_command(Msg.PING) + "?")
+        self._pong_frame = b"!" + self._cmd[Msg.PONG]
+        self._setup_payload: bytes = model.setup_blob
         self._connect_lock = asyncio.Lock()
         self.host: str
         self.timeout: float
         self._connection_enabled: bool
-        self._healthy: Optional[bool] = attr.ib(
-            converter=attr.converters.optional(bool), default=None
-        )
+        self._healthy: Optional[bool] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._last_message_time: float = -1.0
-        self._connect_lock: asyncio.Lock  # = attr.ib(default=attr.Factory(asyncio.Lock))
+        self._connect_lock: asyncio.Lock
         self._reconnect_task: asyncio.Task = None
-        self._monitor_handle: asyncio.TimerHandle
-        self._protocol: LyngdorfProtocol
-        self._callbacks: Dict[str, Callable] = {}
-        self._notification_callbacks: List = list()
+        self._callback_queue: asyncio.Queue = asyncio.Queue(CALLBACK_QUEUE_SIZE)
+        self._callback_worker: Optional[asyncio.Task] = None
+        self._keep_alive_task: Optional[asyncio.Task] = None
+        self._pong_event = asyncio.Event()
+        self._protocol: Optional[LyngdorfProtocol] = None
+        # insertion-ordered callback -> "is a coroutine function", worked out
+        # once at registration and O(1) to unregister
+        self._callbacks: DefaultDict[bytes, Dict[Callable, bool]] = defaultdict(dict)
+        self._notification_callbacks: Dict[Callable, bool] = {}
+        # immutable copy of the above for dispatch, rebuilt on (un)registration
+        self._notification_snapshot: tuple = ()
 
     async def async_connect(self) -> None:
         """Connect to the receiver asynchronously."""
@@ -118,7 +308,7 @@ class LyngdorfApi:
     async def _async_establish_connection(self) -> None:
         """Establish a connection to the receiver."""
         _LOGGER.info("%s: establishing connection", self.host)
-        loop = asyncio.get_event_loop()
+        loop = self._loop = asyncio.get_running_loop()
         try:
             async with asyncio_timeout(2.0):
                 transport_protocol = await loop.create_connection(
@@ -137,46 +327,68 @@ class LyngdorfApi:
             raise ConnectionRefusedError(
                 f"ConnectionRefusedError: {err}", "connect"
             ) from err
+        self._configure_socket(transport_protocol[0].get_extra_info("socket"))
         self._protocol = cast(LyngdorfProtocol, transport_protocol[1])  # type: ignore
         self._connection_enabled = True
-        self._last_message_time = time.monotonic()
-        self._schedule_monitor()
+        self._last_message_time = loop.time()
+        self._start_keep_alive()
+        if self._callback_worker is None:
+            self._callback_worker = asyncio.create_task(self._async_callback_worker())
         self._writeSetup()
         _LOGGER.debug("%s: connection complete", self.host)
 
-    def _schedule_monitor(self) -> None:
-        """Start the monitor task."""
-        loop = asyncio.get_event_loop()
-        self._monitor_handle = loop.call_later(MONITOR_INTERVAL, self._monitor)
-
-    def _stop_monitor(self) -> None:
-        """Stop the monitor task."""
-        if self._monitor_handle is not None:
-            self._monitor_handle.cancel()
-            self._monitor_handle = None
-
-    def _monitor(self) -> None:
-        """Monitor the connection."""
-        time_since_response = time.monotonic() - self._last_message_time
-        if time_since_response > MONITOR_INTERVAL * 4:
-            _LOGGER.info(
-                "%s: Keep alive failed, disconnecting and reconnecting", self.host
-            )
-            if self._protocol is not None:
-                self._protocol.close()
-            self._handle_disconnected()
+    def _configure_socket(self, sock) -> None:
+        """Send each small command immediately rather than waiting on Nagle,
+        and let the kernel notice a receiver that has silently gone away."""
+        if sock is None:
             return
-
-        if time_since_response > MONITOR_INTERVAL and self._protocol:
-            # Keep the connection alive
-            self._writeCommand(f'{self._model.lookup_command(Msg.PING)}?')
-        self._schedule_monitor()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # the tuning knobs are Linux only
+        for option, value in (
+            ("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+    def _start_keep_alive(self) -> None:
+        """Start the keep-alive task."""
+        self._stop_keep_alive()
+        self._keep_alive_task = asyncio.create_task(self._async_keep_alive())
+
+    def _stop_keep_alive(self) -> None:
+        """Stop the keep-alive task."""
+        if self._keep_alive_task is not None:
+            self._keep_alive_task.cancel()
+            self._keep_alive_task = None
+
+    async def _async_keep_alive(self) -> None:
+        """Ping the receiver when it goes quiet, and drop the connection if it doesn't answer."""
+        while True:
+            await asyncio.sleep(MONITOR_INTERVAL)
+            if self._loop.time() - self._last_message_time < MONITOR_INTERVAL:
+                continue
+            self._pong_event.clear()
+            self._writeCommand(self._ping_frame)
+            try:
+                async with asyncio_timeout(KEEP_ALIVE_TIMEOUT):
+                    await self._pong_event.wait()
+            except asyncio.TimeoutError:
+                _LOGGER.info(
+                    "%s: Keep alive failed, disconnecting and reconnecting", self.host
+                )
+                # connection_lost then runs _handle_disconnected, which reconnects
+                if self._protocol is not None:
+                    self._protocol.close()
+                return
 
     def _handle_disconnected(self) -> None:
         """Handle disconnected."""
         _LOGGER.debug("%s: disconnected", self.host)
         self._protocol = None
-        self._stop_monitor()
+        self._stop_keep_alive()
         if not self._connection_enabled:
             return
         self._reconnect_task = asyncio.create_task(self._async_reconnect())
@@ -185,10 +397,15 @@ class LyngdorfApi:
         """Close the connection to the receiver asynchronously."""
         async with self._connect_lock:
             self._connection_enabled = False
-            self._stop_monitor()
+            self._stop_keep_alive()
             if self._reconnect_task is not None:
                 self._reconnect_task.cancel()
                 self._reconnect_task = None
+            if self._callback_worker is not None:
+                self._callback_worker.cancel()
+                self._callback_worker = None
+            while not self._callback_queue.empty():
+                self._callback_queue.get_nowait().close()
             if self._protocol is not None:
                 self._protocol.close()
                 self._protocol = None
@@ -196,6 +413,7 @@ class LyngdorfApi:
     async def _async_reconnect(self) -> None:
         """Reconnect to the receiver asynchronously."""
         backoff = RECONNECT_BACKOFF
+        failures = 0
         _LOGGER.debug("Trying to reconnect")
         while self._connection_enabled and not self.healthy:
             _LOGGER.debug("Trying to reconnect...")
@@ -203,189 +421,160 @@ class LyngdorfApi:
                 try:
                     await self._async_establish_connection()
                 except Exception:  # pylint: disable=broad-except
-                    _LOGGER.error(
-                        "%s: Unexpected exception on Lyngdorf reconnect",
+                    # only the first failure of an outage is worth a warning,
+                    # the rest would just repeat it every backoff
+                    failures += 1
+                    if failures == 1:
+                        _LOGGER.warning(
+                            "%s: Unexpected exception on Lyngdorf reconnect",
+                            self.host,
+                            exc_info=True,
+                        )
+                    else:
+                        _LOGGER.debug(
+                            "%s: Lyngdorf reconnect attempt %d failed",
+                            self.host,
+                            failures,
+                        )
+                else:
+                    _LOGGER.info(
+                        "%s: Lyngdorf reconnected after %d failed attempts",
                         self.host,
-                        exc_info=True,
+                        failures,
                     )
-                else:
-                    _LOGGER.info("%s: Lyngdorf reconnected", self.host)
                     return
 
-            await asyncio.sleep(backoff)
+            # jittered, so receivers dropped together don't reconnect in lockstep
+            await asyncio.sleep(backoff * (0.5 + random.random()))
             backoff = min(RECONNECT_MAX_WAIT, backoff * RECONNECT_SCALE)
 
     def _writeSetup(self):
-        for cmd in self._model.setup_commands:
-            self._writeCommand(cmd)
+        self._protocol.write(self._setup_payload)
+        _LOGGER.debug("%s send: %d setup bytes", self.host, len(self._setup_payload))
 
-    def _writeCommand(self, command):
-        """Send a command to the receiver."""
-        self._protocol.write(f"!{command}\r")
-        _LOGGER.debug("%s send: '!%s'", self.host, command)
+    def _writeCommand(self, frame: bytes):
+        """Send an encoded '!COMMAND\\r' frame to the receiver."""
+        self._protocol.write(frame)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s send: %r", self.host, frame)
 
-    def power_on(self, enabled: bool):
-        if enabled:
-            self._writeCommand(f'{self._model.lookup_command(Msg.POWER_ON)}')
-        else:
-            self._writeCommand(f'{self._model.lookup_command(Msg.POWER_OFF)}')
+    def toggle(self, key: str, enabled: bool) -> None:
+        """Switch one of the on/off settings in _TOGGLES, eg toggle("mute", True)."""
+        self._writeCommand(self._toggle_frames[key, enabled])
 
-    def zone_b_power_on(self, enabled: bool):
-        if enabled:
-            self._writeCommand(f'{self._model.lookup_command(Msg.ZONE_B_POWER_ON)}')
-        else:
-            self._writeCommand(f'{self._model.lookup_command(Msg.ZONE_B_POWER_OFF)}')
-
-    def mute_enabled(self, mute: bool):
-        if mute:
-            self._writeCommand(f'{self._model.lookup_command(Msg.MUTE_ON)}')
-        else:
-            self._writeCommand(f'{self._model.lookup_command(Msg.MUTE_OFF)}')
-
-    def zone_b_mute_enabled(self, mute: bool):
-        if mute:
-            self._writeCommand(f'{self._model.lookup_command(Msg.ZONE_B_MUTE_ON)}')
-        else:
-            self._writeCommand(f'{self._model.lookup_command(Msg.ZONE_B_MUTE_OFF)}')
-
-    def volume_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.VOLUME)}+')
-
-    def volume_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.VOLUME)}-')
-
-    def zone_b_volume_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.ZONE_B_VOLUME)}+')
-
-    def zone_b_volume_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.ZONE_B_VOLUME)}-')
-
-    def volume(self, volume: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.VOLUME)}({volume*10.0:.0f})")
-
-    def zone_b_volume(self, volume: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.VOLUME)}({volume*10.0:.0f})")
-
-    def change_source(self, source: int):
-        self._writeCommand(f"{self._model.lookup_command(Msg.SOURCE)}({source})")
-
-    def change_zone_b_source(self, zone_b_source: int):
-        self._writeCommand(f"{self._model.lookup_command(Msg.ZONE_B_SOURCE)}({zone_b_source})")
-
-    def change_sound_mode(self, sound_mode: int):
-        self._writeCommand(f"{self._model.lookup_command(Msg.AUDIO_MODE)}({sound_mode})")
-        
     def change_hdmi_main_out(self, hdmi_index: int):
-        self._writeCommand(f"HDMIMAINOUT({hdmi_index})")
-        
-    def change_room_perfect_position(self, room_perfect_position_index: int):
-        self._writeCommand(f"{self._model.lookup_command(Msg.ROOM_PERFECT_POSITION)}({room_perfect_position_index})")
-    
-    def change_lipsync(self, lipsync: int):
-        self._writeCommand(f"{self._model.lookup_command(Msg.LIP_SYNC)}({lipsync})")
-    
-    def change_voicing(self, voicing: int):
-        self._writeCommand(f"{self._model.lookup_command(Msg.ROOM_PERFECT_VOICING)}({voicing})")
-        
-    def change_trim_bass(self, trim: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.TRIM_BASS)}({trim*10.0:.0f})")
-    
-    def change_trim_centre(self, trim: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.TRIM_CENTRE)}({trim*10.0:.0f})")
-        
-    def change_trim_height(self, trim: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.TRIM_HEIGHT)}({trim*10.0:.0f})")
-        
-    def change_trim_lfe(self, trim: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.TRIM_LFE)}({trim*10.0:.0f})")
-        
-    def change_trim_surround(self, trim: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.TRIM_SURROUND)}({trim*10.0:.0f})")
-        
-    def change_trim_treble(self, trim: float):
-        self._writeCommand(f"{self._model.lookup_command(Msg.TRIM_TREBLE_SET)}({trim*10.0:.0f})")
-        
-    def trim_bass_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_BASS)}+')
-
-    def trim_bass_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_BASS)}-')
-        
-    def trim_centre_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_CENTRE)}+')
-
-    def trim_centre_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_CENTRE)}-')
-    
-    def trim_height_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_HEIGHT)}+')
-
-    def trim_height_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_HEIGHT)}-')
-
-    def trim_lfe_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_LFE)}+')
-
-    def trim_lfe_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_LFE)}-')
-        
-    def trim_surround_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_SURROUND)}+')
-
-    def trim_surround_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_SURROUND)}-')
-        
-    def trim_treble_up(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_TREBLE_SET)}+')
-
-    def trim_treble_down(self):
-        self._writeCommand(f'{self._model.lookup_command(Msg.TRIM_TREBLE_SET)}-')
-        
-    def _process_event(self, message: str) -> None:
+        self._writeCommand(b"!HDMIMAINOUT(%d)\r" % hdmi_index)
+
+    # Table of the commands that only differ by their token and argument shape
+    power_on = _toggle_command("power")
+    zone_b_power_on = _toggle_command("zone_b_power")
+    mute_enabled = _toggle_command("mute")
+    zone_b_mute_enabled = _toggle_command("zone_b_mute")
+    volume = _scaled_command(Msg.VOLUME)
+    zone_b_volume = _scaled_command(Msg.ZONE_B_VOLUME)
+    change_trim_bass = _scaled_command(Msg.TRIM_BASS)
+    change_trim_centre = _scaled_command(Msg.TRIM_CENTRE)
+    change_trim_height = _scaled_command(Msg.TRIM_HEIGHT)
+    change_trim_lfe = _scaled_command(Msg.TRIM_LFE)
+    change_trim_surround = _scaled_command(Msg.TRIM_SURROUND)
+    change_trim_treble = _scaled_command(Msg.TRIM_TREBLE_SET)
+
+    change_source = _indexed_command(Msg.SOURCE)
+    change_zone_b_source = _indexed_command(Msg.ZONE_B_SOURCE)
+    change_sound_mode = _indexed_command(Msg.AUDIO_MODE)
+    change_room_perfect_position = _indexed_command(Msg.ROOM_PERFECT_POSITION)
+    change_lipsync = _indexed_command(Msg.LIP_SYNC)
+    change_voicing = _indexed_command(Msg.ROOM_PERFECT_VOICING)
+
+    volume_up = _step_command(Msg.VOLUME, "+")
+    volume_down = _step_command(Msg.VOLUME, "-")
+    zone_b_volume_up = _step_command(Msg.ZONE_B_VOLUME, "+")
+    zone_b_volume_down = _step_command(Msg.ZONE_B_VOLUME, "-")
+    trim_bass_up = _step_command(Msg.TRIM_BASS, "+")
+    trim_bass_down = _step_command(Msg.TRIM_BASS, "-")
+    trim_centre_up = _step_command(Msg.TRIM_CENTRE, "+")
+    trim_centre_down = _step_command(Msg.TRIM_CENTRE, "-")
+    trim_height_up = _step_command(Msg.TRIM_HEIGHT, "+")
+    trim_height_down = _step_command(Msg.TRIM_HEIGHT, "-")
+    trim_lfe_up = _step_command(Msg.TRIM_LFE, "+")
+    trim_lfe_down = _step_command(Msg.TRIM_LFE, "-")
+    trim_surround_up = _step_command(Msg.TRIM_SURROUND, "+")
+    trim_surround_down = _step_command(Msg.TRIM_SURROUND, "-")
+    trim_treble_up = _step_command(Msg.TRIM_TREBLE_SET, "+")
+    trim_treble_down = _step_command(Msg.TRIM_TREBLE_SET, "-")
+
+    def _process_event(self, message: bytes) -> None:
         """Process a realtime event."""
 
-        _LOGGER.debug("%s recv: '%s'", self.host, message)
-        # print("\r"+message+"\r")
-        self._last_message_time = time.monotonic()
-        if message.startswith("!"):
-            cmd: str = ""
-            first: str = ""
-            second: str = ""
-            message = message[1:]
-            if 1 < message.find("(") < message.find(")"):
-                cmd = message[: message.find("(")]
-                first = message[1 + message.find("(") : message.find(")")]
-                second = message[1 + message.find(")") :]
-            else:
-                cmd = message
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s recv: %r", self.host, message)
+        self._last_message_time = self._loop.time()
+        if message.startswith(self._pong_frame):
+            # keep-alive reply, nothing to dispatch
+            self._pong_event.set()
+            return
+        match = _EVENT_RE.fullmatch(message)
+        if match is not None:
+            cmd, first, quoted, second = match.groups(b"")
+            second = quoted or second
+        elif message.startswith(b"!"):
+            cmd, first, second = message[1:], b"", b""
+        else:
+            return
 
-            if cmd == self._model.lookup_command(Msg.PONG):
+        # the command token is matched as bytes; only decode its parameters
+        # when something is registered to receive them
+        callbacks = self._callbacks.get(cmd)
+        if callbacks:
+            try:
+                param1, param2 = first.decode("utf-8"), second.decode("utf-8")
+            except UnicodeDecodeError:
                 return
-
-            if len(second) > 0 and second.startswith('"') and second.endswith('"'):
-                second = second[1:-1]
-            asyncio.create_task(self._async_run_callbacks(cmd, first, second))
-            asyncio.create_task(self._notify_notification_callbacks())
+            self._run_callbacks(cmd, callbacks, param1, param2)
+        self._notify_notification_callbacks()
 
     def register_notification_callback(self, callback: Callable[[], None]) -> None:
-        self._notification_callbacks.append(callback)
+        self._notification_callbacks[callback] = asyncio.iscoroutinefunction(callback)
+        self._notification_snapshot = tuple(self._notification_callbacks.items())
 
     def un_register_notification_callback(self, callback: Callable[[], None]) -> None:
-        self._notification_callbacks.remove(callback)
+        self._notification_callbacks.pop(callback, None)
+        self._notification_snapshot = tuple(self._notification_callbacks.items())
 
-    async def _notify_notification_callbacks(self) -> None:
-        for callback in self._notification_callbacks:
+    def _notify_notification_callbacks(self) -> None:
+        # the snapshot lets callbacks (un)register during the fan-out
+        for callback, is_coroutine in self._notification_snapshot:
             try:
-                callback()
-            except Exception as err:
+                if is_coroutine:
+                    self._queue_coroutine(callback())
+                else:
+                    callback()
+            except Exception:  # pylint: disable=broad-except
                 # We don't want a single bad callback to trip up the
                 # whole system and prevent further execution
-                # TIM. TODO. need to log the stack trace of the error found here, as at the moment v hard to find errors
+                _LOGGER.exception(
+                    "%s: Event callback caused an unhandled exception", self.host
+                )
 
-                _LOGGER.error(
-                    "%s: Event callback caused an unhandled exception '%s' (%s)",
-                    self.host,
-                    traceback.format_exc(),
+    def _queue_coroutine(self, coroutine) -> None:
+        """Queue the coroutine of an async callback for the worker."""
+        try:
+            self._callback_queue.put_nowait(coroutine)
+        except asyncio.QueueFull:
+            coroutine.close()
+            _LOGGER.warning(
+                "%s: Too many callbacks waiting to run, dropping %s", self.host, coroutine
+            )
+
+    async def _async_callback_worker(self) -> None:
+        """Run queued async callbacks one at a time."""
+        while True:
+            coroutine = await self._callback_queue.get()
+            try:
+                await coroutine
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "%s: Async event callback caused an unhandled exception", self.host
                 )
 
     def register_callback(
@@ -393,33 +582,44 @@ class LyngdorfApi:
     ) -> None:
         """Register a callback handler for an event type."""
 
-        if command not in self._callbacks.keys():
-            self._callbacks[command] = []
-        self._callbacks[command].append(callback)
+        self._callbacks[command.encode("utf-8")][callback] = asyncio.iscoroutinefunction(
+            callback
+        )
 
-    async def _async_run_callbacks(
-        self, command: str, param1: str, param2: str
+    def register_callbacks(
+        self, callbacks: Iterable[Tuple[str, Callable[[str, str], None]]]
+    ) -> None:
+        """Register a batch of (command, callback) handlers."""
+        registry = self._callbacks
+        is_coroutine = asyncio.iscoroutinefunction
+        for command, callback in callbacks:
+            registry[command.encode("utf-8")][callback] = is_coroutine(callback)
+
+    def _run_callbacks(
+        self,
+        command: bytes,
+        callbacks: Dict[Callable, bool],
+        param1: str,
+        param2: str,
     ) -> None:
         """Handle triggering the registered callbacks for the event."""
-        if command in self._callbacks.keys():
-            for callback in self._callbacks[command]:
-                try:
-                    # _LOGGER.debug("Command %s callback (%s, %s) calling %s", command, param1, param2, callback)
+        for callback, is_coroutine in tuple(callbacks.items()):
+            try:
+                if is_coroutine:
+                    self._queue_coroutine(callback(param1, param2))
+                else:
                     callback(param1, param2)
-                except Exception as err:  # pylint: disable=broad-except
-                    # We don't want a single bad callback to trip up the
-                    # whole system and prevent further execution
-                    # TIM. TODO. need to log the stack trace of the error found here, as at the moment v hard to find errors
-
-                    _LOGGER.error(
-                        "%s: Event callback caused an unhandled exception '%s' for Command %s callback (%s, %s) calling %s",
-                        self.host,
-                        traceback.format_exc(),
-                        command,
-                        param1,
-                        param2,
-                        callback,
-                    )
+            except Exception:  # pylint: disable=broad-except
+                # We don't want a single bad callback to trip up the
+                # whole system and prevent further execution
+                _LOGGER.exception(
+                    "%s: Event callback %s for command %s (%s, %s) caused an unhandled exception",
+                    self.host,
+                    callback,
+                    command,
+                    param1,
+                    param2,
+                )
 
     @property
     def connected(self) -> bool:
@@ -22,6 +22,39 @@ class CountingNumberDict(dict):
     def __init__(self, count: int = 0):
         super().__init__()
         self.count: int = count
+        # value -> first index holding it, so lookupIndex needn't scan
+        self._reverse: dict = {}
+
+    def __setitem__(self, index: int, value: str):
+        if index in self:
+            self._forget(index, self[index])
+        super().__setitem__(index, value)
+        self._reverse.setdefault(value, index)
+
+    def __delitem__(self, index: int):
+        value = self[index]
+        super().__delitem__(index)
+        self._forget(index, value)
+
+    def pop(self, index: int, *default):
+        if index not in self:
+            return super().pop(index, *default)
+        value = super().pop(index)
+        self._forget(index, value)
+        return value
+
+    def clear(self):
+        super().clear()
+        self._reverse.clear()
+
+    def _forget(self, index: int, value: str):
+        if self._reverse.get(value) != index:
+            return
+        del self._reverse[value]
+        for k, v in self.items():
+            if v == value and k != index:
+                self._reverse[value] = k
+                break
 
     def is_full(self) -> bool:
         return len(self.keys()) >= self.count
@@ -38,7 +71,4 @@ class CountingNumberDict(dict):
         return list(self.values()) 
 
     def lookupIndex(self, value: str):
-        for k, v in self.items():
-            if value == v:
-                return k
-        return -1
+        return self._reverse.get(value, -1)
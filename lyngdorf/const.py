@@ -6,18 +6,24 @@ This module inherits constants for Lyngdorf receivers.
 :license: MIT, see LICENSE for more details.
 """
 
-import attr
-from enum import Enum
-from typing import Dict
+from enum import Enum, IntEnum
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
 
-ATTR_SETATTR = [attr.setters.validate, attr.setters.convert]
-
 DEFAULT_LYNGDORF_PORT = 84
 RECONNECT_BACKOFF = 0.5 # half a second to wait for the first reconnect
 RECONNECT_SCALE = 2.5 # each reconnect attempt waits this times longer than the previous one
 RECONNECT_MAX_WAIT = 30.0 # Reconnect tasks will wait this many seconds at a maximum between each attempt
 MONITOR_INTERVAL = 90 # 90 seconds between PING commands
+KEEP_ALIVE_TIMEOUT = 5 # seconds to wait for the PONG before treating the connection as dead
+TCP_KEEPALIVE_IDLE = 20 # seconds of silence before the kernel starts probing the receiver
+TCP_KEEPALIVE_INTERVAL = 10 # seconds between kernel keep-alive probes
+TCP_KEEPALIVE_COUNT = 3 # unanswered probes before the kernel drops the connection
+RECEIVE_BUFFER_SIZE = 65536 # bytes preallocated for each connection's receive buffer
+MAX_MESSAGE_SIZE = 262144 # longest line we will buffer, anything longer is dropped as runaway input
+CALLBACK_QUEUE_SIZE = 256 # async callbacks waiting to run before new ones are dropped
+DISCOVERY_TIMEOUT = 2.0 # seconds allowed for the whole model probe, connect to close
 
 POWER_ON = "1"
 POWER_OFF = "0"
@@ -85,8 +91,20 @@ MP60_STREAM_TYPES = {
     6: "Roon ready",
     7: "Unknown",
 }
+
+
+def _id_table(names: Dict[int, str]) -> Tuple[Optional[str], ...]:
+    """Lay out an id -> name dict as a tuple indexed by id, None for the gaps."""
+    return tuple(names.get(index) for index in range(max(names) + 1))
+
+
+MP60_VIDEO_INPUTS_TBL = _id_table(MP60_VIDEO_INPUTS)
+MP60_VIDEO_OUTPUTS_TBL = _id_table(MP60_VIDEO_OUTPUTS)
+MP60_AUDIO_INPUTS_TBL = _id_table(MP60_AUDIO_INPUTS)
+MP60_ROOM_PERFECT_POSITIONS_TBL = _id_table(MP60_ROOM_PERFECT_POSITIONS)
+MP60_STREAM_TYPES_TBL = _id_table(MP60_STREAM_TYPES)
     
-Msg = Enum('Msg',
+Msg = IntEnum('Msg',
     ['DEVICE','VERBOSE', 'PING','PONG',
      'POWER', 'POWER_ON', 'POWER_OFF', 'VOLUME', 'MUTE', 'MUTE_ON', "MUTE_OFF", 'SOURCES_COUNT', 'SOURCE',
      'ZONE_B_POWER', 'ZONE_B_POWER_ON', 'ZONE_B_POWER_OFF', 'ZONE_B_VOLUME', 'ZONE_B_MUTE_ON', "ZONE_B_MUTE_OFF", 'ZONE_B_SOURCES_COUNT', 'ZONE_B_SOURCE',
@@ -95,12 +113,13 @@ Msg = Enum('Msg',
      'ROOM_PERFECT_POSITIONS_COUNT', 'ROOM_PERFECT_POSITION', 'ROOM_PERFECT_VOICINGS_COUNT', 'ROOM_PERFECT_VOICING',
      'LIP_SYNC', 'LIP_SYNC_MIN_MAX',
      'TRIM_BASS', 'TRIM_CENTRE', 'TRIM_HEIGHT', 'TRIM_LFE', 'TRIM_SURROUND', 'TRIM_TREBLE', 'TRIM_TREBLE_SET'
-     ]
+     ],
+    start=0
     )
 
 
 
-MP60_MESSAGES: Dict[Msg, str] = {
+MP60_MESSAGES: Mapping[Msg, str] = MappingProxyType({
     Msg.DEVICE: "DEVICE",
     Msg.VERBOSE: "VERB",
     Msg.PING: "PING",
@@ -144,10 +163,16 @@ MP60_MESSAGES: Dict[Msg, str] = {
     Msg.TRIM_SURROUND: "TRIMSURRS",
     Msg.TRIM_TREBLE: "TRIMTREBLE",
     Msg.TRIM_TREBLE_SET: "TRIMTREB"
-}
+})
+
+MP60_MESSAGES_REV: Mapping[str, Msg] = MappingProxyType(
+    {v: k for k, v in MP60_MESSAGES.items()}
+)
+# the same tokens indexed by Msg value, for lookups without hashing
+MP60_COMMANDS: Tuple[str, ...] = tuple(MP60_MESSAGES[msg] for msg in Msg)
  
 
-MP60_SETUP_MESSAGES = [
+MP60_SETUP_MESSAGES = (
     "VERB(1)",
     "DEVICE?",
     "POWER?",
@@ -165,7 +190,7 @@ MP60_SETUP_MESSAGES = [
     "RPVOI?",
     "VIDTYPE?",
     "STREAMTYPE?",
-    "LIPSYNC?"
+    "LIPSYNC?",
     "ZSTREAMTYPE?",
     
     "AUDIN?",
@@ -181,105 +206,48 @@ MP60_SETUP_MESSAGES = [
     "TRIMHEIGHT?",
     "TRIMLFE?",
     "TRIMSURRS?",
-    "TRIMTREB?"
-]
+    "TRIMTREB?",
+)
 
+# the whole setup batch as it goes on the wire, so a (re)connect is one write
+MP60_SETUP_BLOB: bytes = "".join(
+    f"!{command}\r" for command in MP60_SETUP_MESSAGES
+).encode("utf-8")
 
-# @dataclass
-# class LyngdorfModelMixin:
-#     _model: str
-#     _manufacterer: str
-#     _commands: Dict[Msg, str]
-#     _setup_commands: list[str]
-    
-#     @property
-#     def model(self) -> str:
-#         return self._model
-    
-#     @property
-#     def manufacturer(self) -> str:
-#         return self._manufacterer
-    
-#     @property
-#     def setup_commands(self) -> list[str]:
-#         return self._setup_commands
-    
-#     @property
-#     def commands(self) -> Dict[Msg, str]:
-#         return self._commands
-    
-#     def lookup_command(self, key: Msg) -> str:
-#         return self.commands[key]
-@dataclass
+
+# frozen so a model's tables can't be swapped out from under live connections;
+# eq=False keeps Enum's identity equality and name hash, so models can be dict keys
+@dataclass(frozen=True, eq=False)
 class LyngdorfModelMixin:
-    _model: str
-    _manufacterer: str
-    _commands: Dict[Msg, str]
-    _setup_commands: list[str]
-    
-    @property
-    def model(self) -> str:
-        return self._model
-    
-    @property
-    def manufacturer(self) -> str:
-        return self._manufacterer
-    
-    @property
-    def setup_commands(self) -> list[str]:
-        return self._setup_commands
-    
+    model: str
+    manufacturer: str
+    commands: Tuple[str, ...]
+    setup_commands: Tuple[str, ...]
+    setup_blob: bytes
+    messages: Mapping[str, Msg]
+
+    def __post_init__(self) -> None:
+        # shadow the methods below with the tables' own bound lookups, so a lookup
+        # is a single C call; object.__setattr__ because the dataclass is frozen
+        object.__setattr__(self, "lookup_command", self.commands.__getitem__)
+        object.__setattr__(self, "lookup_msg", self.messages.get)
+
     def lookup_command(self, key: Msg) -> str:
-        return self._commands[key]
-    
+        return self.commands[key]
+
+    def lookup_msg(self, token: str) -> Optional[Msg]:
+        return self.messages.get(token)
+
 
 class LyngdorfModel(LyngdorfModelMixin, Enum):
-    MP_60 = "mp-60", "Lyngdorf", MP60_MESSAGES, MP60_SETUP_MESSAGES
+    MP_60 = "mp-60", "Lyngdorf", MP60_COMMANDS, MP60_SETUP_MESSAGES, MP60_SETUP_BLOB, MP60_MESSAGES_REV
 
+    @classmethod
+    def from_model_string(cls, model: str) -> Optional["LyngdorfModel"]:
+        """Return the model named by a DEVICE/model string (any case), or None."""
+        return _MODELS_BY_NAME.get(model.casefold())
 
-# RESPONSES = {
-#     "AUDIN": "Selected audio input",
-#     "AUDMODE": "Audio processing mode",
-#     "AUDMODECOUNT": "List of audio processing modes",
-#     "AUDTYPE": "String describing the current audio input type",
-#     "DEFVOL": "Default volume setting",
-#     "DEVICE": "Device Name",
-#     "DTSDIALOG": "DTS Dialog Control",
-#     "DTSDIALOGAVAILABLE": "Current availability of DTS Dialog Control",
-#     "HDMIMAINOUT": "Which HDMI output is used for main out",
-#     "LIPSYNC": 
-#     "LOUDNESS": "Loudness status",
-#     "MAXVOL": "Maximum volume setting",
-#     "POWER": "Power status",
-#     "POWERZONE2": "Power status for Zone B",
-#     "MUTEON": "Mute is ON",
-#     "MUTEOFF": "Mute is OFF",
-#     "RPFOC": "RoomPerfect position",
-#     "RPFOCCOUNT": "Available RoomPerfect positions",
-#     "RPVOI": "Active voicing",
-#     "RPVOICOUNT": "List of available voicings",
-#     "SRCOFF": "Source volume offset for current source",
-#     "SRCCOUNT": "List of available sources",
-#     "STANDBYLEVEL": "Current setting for standby level",
-#     "STREAMTYPE": "Type of the current network player source",
-#     "TRIMBASS": "Bass level trim (10 = 1dB)",
-#     "TRIMCENTER": "Center channel level trim (10 = 1dB)",
-#     "TRIMHEIGHT": "Height channels level trim (10 = 1dB)",
-#     "TRIMLFE": "LFE channel level trim (10 = 1dB)",
-#     "TRIMSURRS": "Surround channels level trim (10 = 1dB)",
-#     "TRIMTREB": "Treble level trim (10 = 1dB)",
-#     "VERB": "Verbosity level of active interface.",
-#     "VIDIN": "Selected video input",
-#     "VIDTYPE": "Current video input",
-#     "VOL": "Main Volume",
-#     "ZAUDIN": "Zone B audio input. (See list)",
-#     "ZSRCCOUNT": "List of available Zone B sources",
-#     "ZSTREAMTYPE": "Type of the network player when playing on Zone B",
-#     "ZVOL": "Zone B volume",
-#     "SRC": "Active source",
-#     "ZSRC": "Zone B source",
-#     "ZMUTEON": "Zone B Mute is ON",
-#     "ZMUTEOFF": "Zone B Mute is OFF",
-# }
 
-# RESPONSES_KEYS_ALL = sorted(set(RESPONSES.keys()))
+_MODELS_BY_NAME: Dict[str, LyngdorfModel] = {
+    model.model.casefold(): model for model in LyngdorfModel
+}
@@ -1,159 +1,284 @@
-import logging
-import traceback
 import asyncio
+import logging
 import socket
-from attr import field, validators
-from typing import Union, Callable, List
+import time
+from asyncio import timeout as asyncio_timeout
+from contextlib import suppress
+from operator import attrgetter, methodcaller
+from typing import Callable, ClassVar, Dict, Iterable, Optional, Tuple
 from .api import LyngdorfApi
 from .base import CountingNumberDict
-from .const import POWER_ON, LyngdorfModel, Msg, DEFAULT_LYNGDORF_PORT
+from .const import POWER_ON, LyngdorfModel, Msg, DEFAULT_LYNGDORF_PORT, DISCOVERY_TIMEOUT
 from .exceptions import LyngdorfInvalidValueError
 
 _LOGGER = logging.getLogger(__package__)
 
+# the !DEVICE(...) reply is short; give up on anything longer than this
+_MAX_PROBE_REPLY = 256
 
-def convert_decibel(value: Union[float, str]) -> float:
-    """Convert volume to float."""
-    return float(value) / 10.0
+# each receiver class's _CALLBACK_BINDINGS resolved against its model's command
+# tokens, built on first connect
+_RESOLVED_BINDINGS: Dict[Tuple[type, LyngdorfModel], Tuple[Tuple[str, attrgetter], ...]] = {}
 
 
-class Receiver:
-    """Lyngdorf client class."""
+def _lookup_id(table: Tuple[Optional[str], ...], index: int) -> Optional[str]:
+    """Return the name for index in one of the const *_TBL tables, or None."""
+    if 0 <= index < len(table):
+        return table[index]
+    return None
 
-    _api: LyngdorfApi
-    _model: LyngdorfModel = None
-    _host: str = None
-    
-    _stream_types=dict()
-    _audio_inputs=dict()
-    _video_inputs=dict()
-    
-    _notification_callbacks: List = list()
-
-    _name: str = None
-    _volume: float = field(validator=[validators.ge(-99.9), validators.lt(10.0)],default=None)
-    _zone_b_volume: float = field(validator=[validators.ge(-99.9), validators.lt(10.0)],default=None)
-    _mute_enabled: bool = None
-    _zone_b_mute_enabled: bool = None
-    _sources = CountingNumberDict()
-    _source: str = None
-    _zone_b_sources = CountingNumberDict()
-    _zone_b_source: str = None
-    _sound_modes = CountingNumberDict()
-    _sound_mode: str = None
-    _audio_input: str = None
-    _zone_b_audio_input: str = None
-    _video_input: str = None
-    _audio_info: str = None
-    _video_info: str = None
-    _streaming_source: str = None
-    _zone_b_streaming_source: str = None
-    _zone_b_audio_info: str = None
-    _power_on: bool = None
-    _zone_b_power_on: bool = None
-    
-    # Trims
-    _trim_bass: float = field(validator=[validators.ge(-12.0), validators.lt(12.0)],default=None)
-    _trim_centre: float = field(validator=[validators.ge(-10.0), validators.lt(10.0)],default=None)
-    _trim_height: float = field(validator=[validators.ge(-10.0), validators.lt(10.0)],default=None)
-    _trim_lfe: float = field(validator=[validators.ge(-10.0), validators.lt(10.0)],default=None)
-    _trim_surround: float = field(validator=[validators.ge(-10.0), validators.lt(10.0)],default=None)
-    _trim_treble: float = field(validator=[validators.ge(-12.0), validators.lt(12.0)],default=None)
-    
-    
-    # Audio Tuning
-    _room_perfect_positions = CountingNumberDict()
-    _room_perfect_position: str = None
-    _voicings = CountingNumberDict()
-    _voicing: str = None
-    _lipsync: int = None
 
-    def __init__(self, host: str, model: LyngdorfModel):
-        """Initialize the client."""
-        self._host=host
-        self._model=model
-        assert model
-        assert host
-        self._api: LyngdorfApi = LyngdorfApi(host, model)
+def convert_decibel(value: str) -> float:
+    """Convert a wire level in tenths of a dB, eg "-281", to dB."""
+    # public API only; the receiver itself stores int tenths and reads them through _decibels
+    return int(value) / 10
 
-    async def async_connect(self):
+
+def _decibels(tenths: Optional[int]) -> Optional[float]:
+    """Convert a level stored in tenths of a dB to dB, passing through an unknown (None) level."""
+    # true division rather than * 0.1, so 3 gives 0.3 and not 0.30000000000000004
+    return None if tenths is None else tenths / 10
+
+
+def _decibel_callback(attribute: str) -> Callable[["Receiver", str, str], None]:
+    """Build a callback storing a received tenths-of-a-dB level on attribute, eg TRIMBASS(-20)."""
+
+    def callback(self: "Receiver", param1: str, ignored: str) -> None:
+        setattr(self, attribute, int(param1))
+        self._notify()
+
+    return callback
+
+
+def _check_level(name: str, value: float, low: float, high: float) -> None:
+    """Raise LyngdorfInvalidValueError unless low <= value < high."""
+    if not low <= value < high:
+        raise LyngdorfInvalidValueError(
+            "%s of %s is outside [%s, %s), and cannot be set", name, value, low, high
+        )
+
+
+def _trim_property(name: str, low: float, high: float) -> property:
+    """Build a trim property, read from _trim_<name> and set through change_trim_<name>."""
+    attribute = f"_trim_{name}"
+    method = f"change_trim_{name}"
+
+    def getter(self: "Receiver") -> Optional[float]:
+        return _decibels(getattr(self, attribute))
+
+    def setter(self: "Receiver", trim: float) -> None:
+        _check_level(attribute[1:], trim, low, high)
+        getattr(self._api, method)(trim)
+
+    return property(getter, setter)
+
+
+def _api_call(method: str) -> Callable[["Receiver"], None]:
+    """Build a method forwarding straight to the LyngdorfApi method of the same name."""
+    call = methodcaller(method)
+
+    def command(self: "Receiver") -> None:
+        call(self._api)
+
+    return command
+
+
+class Receiver:
+    """Lyngdorf client class."""
+
+    __slots__ = (
+        "_api",
+        "_model",
+        "_commands",
+        "_host",
+        "_notification_callbacks",
+        "_notification_snapshot",
+        "_notify_pending",
+        "_name",
+        "_volume",
+        "_zone_b_volume",
+        "_mute_enabled",
+        "_zone_b_mute_enabled",
+        "_sources",
+        "_source",
+        "_zone_b_sources",
+        "_zone_b_source",
+        "_sound_modes",
+        "_sound_mode",
+        "_audio_input",
+        "_zone_b_audio_input",
+        "_video_input",
+        "_audio_info",
+        "_video_info",
+        "_streaming_source",
+        "_zone_b_streaming_source",
+        "_zone_b_audio_info",
+        "_power_on",
+        "_zone_b_power_on",
+        # Trims
+        "_trim_bass",
+        "_trim_centre",
+        "_trim_height",
+        "_trim_lfe",
+        "_trim_surround",
+        "_trim_treble",
+        # Audio Tuning
+        "_room_perfect_positions",
+        "_room_perfect_position",
+        "_voicings",
+        "_voicing",
+        "_lipsync",
+    )
+
+    # receiver messages and the (dotted) attribute handling each of them
+    _CALLBACK_BINDINGS: ClassVar[Tuple[Tuple[Msg, str], ...]] = (
         # Basics
-        self._api.register_callback(self.lookup_command(Msg.DEVICE), self._name_callback)
+        (Msg.DEVICE, "_name_callback"),
 
         # Volumes and Mutes
-        self._api.register_callback(self.lookup_command(Msg.VOLUME), self._volume_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_VOLUME), self._zone_b_volume_callback)
-        self._api.register_callback(self.lookup_command(Msg.MUTE_ON), self._mute_on_callback)
-        self._api.register_callback(self.lookup_command(Msg.MUTE_OFF), self._mute_off_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_MUTE_ON), self._zone_b_mute_on_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_MUTE_OFF), self._zone_b_mute_off_callback)
+        (Msg.VOLUME, "_volume_callback"),
+        (Msg.ZONE_B_VOLUME, "_zone_b_volume_callback"),
+        (Msg.MUTE_ON, "_mute_on_callback"),
+        (Msg.MUTE_OFF, "_mute_off_callback"),
+        (Msg.ZONE_B_MUTE_ON, "_zone_b_mute_on_callback"),
+        (Msg.ZONE_B_MUTE_OFF, "_zone_b_mute_off_callback"),
 
         # Sources
-        self._api.register_callback(self.lookup_command(Msg.SOURCES_COUNT), self._sources.count_callback)
-        self._api.register_callback(self.lookup_command(Msg.SOURCE), self._source_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_SOURCES_COUNT), self._zone_b_sources.count_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_SOURCE), self._zone_b_source_callback)
-        self._api.register_callback(self.lookup_command(Msg.AUDIO_IN), self._audio_input_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_AUDIO_IN), self._zone_b_audio_input_callback)
-        self._api.register_callback(self.lookup_command(Msg.VIDEO_IN), self._video_input_callback)
-        self._api.register_callback(self.lookup_command(Msg.STREAM_TYPE), self._stream_type_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_STREAM_TYPE), self._zone_b_stream_type_callback)
-        self._api.register_callback(self.lookup_command(Msg.VIDEO_TYPE), self._video_info_callback)
-        self._api.register_callback(self.lookup_command(Msg.AUDIO_TYPE), self._audio_info_callback)
-
-        self._api.register_callback(self.lookup_command(Msg.AUDIO_MODES_COUNT), self._sound_modes.count_callback)
-        self._api.register_callback(self.lookup_command(Msg.AUDIO_MODE), self._sound_mode_callback)
+        (Msg.SOURCES_COUNT, "_sources.count_callback"),
+        (Msg.SOURCE, "_source_callback"),
+        (Msg.ZONE_B_SOURCES_COUNT, "_zone_b_sources.count_callback"),
+        (Msg.ZONE_B_SOURCE, "_zone_b_source_callback"),
+        (Msg.AUDIO_IN, "_audio_input_callback"),
+        (Msg.ZONE_B_AUDIO_IN, "_zone_b_audio_input_callback"),
+        (Msg.VIDEO_IN, "_video_input_callback"),
+        (Msg.STREAM_TYPE, "_stream_type_callback"),
+        (Msg.ZONE_B_STREAM_TYPE, "_zone_b_stream_type_callback"),
+        (Msg.VIDEO_TYPE, "_video_info_callback"),
+        (Msg.AUDIO_TYPE, "_audio_info_callback"),
+        (Msg.AUDIO_MODES_COUNT, "_sound_modes.count_callback"),
+        (Msg.AUDIO_MODE, "_sound_mode_callback"),
 
         # Power
-        self._api.register_callback(self.lookup_command(Msg.POWER), self._power_callback)
-        self._api.register_callback(self.lookup_command(Msg.ZONE_B_POWER), self._zone_b_power_callback)
-        
+        (Msg.POWER, "_power_callback"),
+        (Msg.ZONE_B_POWER, "_zone_b_power_callback"),
+
         # Audio Tuning
-        self._api.register_callback(self.lookup_command(Msg.ROOM_PERFECT_POSITIONS_COUNT), self._room_perfect_positions.count_callback)
-        self._api.register_callback(self.lookup_command(Msg.ROOM_PERFECT_POSITION), self._room_perfect_position_callback)
-        self._api.register_callback(self.lookup_command(Msg.ROOM_PERFECT_VOICINGS_COUNT), self._voicings.count_callback)
-        self._api.register_callback(self.lookup_command(Msg.ROOM_PERFECT_VOICING), self._voicing_callback)
-        self._api.register_callback(self.lookup_command(Msg.LIP_SYNC), self._lipsync_callback)
-        
+        (Msg.ROOM_PERFECT_POSITIONS_COUNT, "_room_perfect_positions.count_callback"),
+        (Msg.ROOM_PERFECT_POSITION, "_room_perfect_position_callback"),
+        (Msg.ROOM_PERFECT_VOICINGS_COUNT, "_voicings.count_callback"),
+        (Msg.ROOM_PERFECT_VOICING, "_voicing_callback"),
+        (Msg.LIP_SYNC, "_lipsync_callback"),
+
         # Trim
-        self._api.register_callback(self.lookup_command(Msg.TRIM_BASS), self._trim_bass_callback)
-        self._api.register_callback(self.lookup_command(Msg.TRIM_CENTRE), self._trim_centre_callback)
-        self._api.register_callback(self.lookup_command(Msg.TRIM_HEIGHT), self._trim_height_callback)
-        self._api.register_callback(self.lookup_command(Msg.TRIM_LFE), self._trim_lfe_callback)
-        self._api.register_callback(self.lookup_command(Msg.TRIM_SURROUND), self._trim_surround_callback)
-        self._api.register_callback(self.lookup_command(Msg.TRIM_TREBLE), self._trim_treble_callback)
+        (Msg.TRIM_BASS, "_trim_bass_callback"),
+        (Msg.TRIM_CENTRE, "_trim_centre_callback"),
+        (Msg.TRIM_HEIGHT, "_trim_height_callback"),
+        (Msg.TRIM_LFE, "_trim_lfe_callback"),
+        (Msg.TRIM_SURROUND, "_trim_surround_callback"),
+        (Msg.TRIM_TREBLE, "_trim_treble_callback"),
+    )
+
+    # the model's id -> name tables, set once on each model's subclass
+    _stream_types: ClassVar[Tuple[Optional[str], ...]] = ()
+    _audio_inputs: ClassVar[Tuple[Optional[str], ...]] = ()
+    _video_inputs: ClassVar[Tuple[Optional[str], ...]] = ()
 
-        
-        
+    def __init__(self, host: str, model: LyngdorfModel):
+        """Initialize the client."""
+        self._host: str = host
+        self._model: LyngdorfModel = model
+        # the model's Msg-indexed command tokens, bound once for lookup_command
+        self._commands: Tuple[str, ...] = model.commands
+        self._api: LyngdorfApi = LyngdorfApi(host, model)
+
+        # a dict used as an insertion-ordered set, for O(1) unregistration,
+        # and the tuple of it that _flush_notify iterates
+        self._notification_callbacks: Dict[Callable[[], None], None] = {}
+        self._notification_snapshot: Tuple[Callable[[], None], ...] = ()
+        self._notify_pending = False
+
+        self._name: str = None
+        # levels are kept as the wire's tenths of a dB, and only turned into dB when read
+        self._volume: Optional[int] = None
+        self._zone_b_volume: Optional[int] = None
+        self._mute_enabled: bool = None
+        self._zone_b_mute_enabled: bool = None
+        self._sources = CountingNumberDict()
+        self._source: str = None
+        self._zone_b_sources = CountingNumberDict()
+        self._zone_b_source: str = None
+        self._sound_modes = CountingNumberDict()
+        self._sound_mode: str = None
+        self._audio_input: str = None
+        self._zone_b_audio_input: str = None
+        self._video_input: str = None
+        self._audio_info: str = None
+        self._video_info: str = None
+        self._streaming_source: str = None
+        self._zone_b_streaming_source: str = None
+        self._zone_b_audio_info: str = None
+        self._power_on: bool = None
+        self._zone_b_power_on: bool = None
+
+        # Trims, in tenths of a dB
+        self._trim_bass: Optional[int] = None
+        self._trim_centre: Optional[int] = None
+        self._trim_height: Optional[int] = None
+        self._trim_lfe: Optional[int] = None
+        self._trim_surround: Optional[int] = None
+        self._trim_treble: Optional[int] = None
+
+        # Audio Tuning
+        self._room_perfect_positions = CountingNumberDict()
+        self._room_perfect_position: str = None
+        self._voicings = CountingNumberDict()
+        self._voicing: str = None
+        self._lipsync: int = None
+
+    async def async_connect(self):
+        key = (type(self), self._model)
+        bindings = _RESOLVED_BINDINGS.get(key)
+        if bindings is None:
+            lookup = self.lookup_command
+            bindings = _RESOLVED_BINDINGS[key] = tuple(
+                (lookup(msg), attrgetter(name)) for msg, name in self._CALLBACK_BINDINGS
+            )
+        self._api.register_callbacks(
+            (command, getter(self)) for command, getter in bindings
+        )
         await self._api.async_connect()
 
     async def async_disconnect(self):
         await self._api.async_disconnect()
         
     def lookup_command(self, key: Msg):
-        return self._model.lookup_command(key)
+        return self._commands[key]
 
     # Notifications Support
     def register_notification_callback(self, callback: Callable[[], None]) -> None:
-        self._notification_callbacks.append(callback)
+        self._notification_callbacks[callback] = None
+        self._notification_snapshot = tuple(self._notification_callbacks)
 
     def un_register_notification_callback(self, callback: Callable[[], None]) -> None:
-        self._notification_callbacks.remove(callback)
-
-    def _notify_notification_callbacks(self) -> None:
-        asyncio.create_task(self._async_notify_notification_callbacks())
-
-    async def _async_notify_notification_callbacks(self) -> None:
-        for callback in self._notification_callbacks:
+        self._notification_callbacks.pop(callback, None)
+        self._notification_snapshot = tuple(self._notification_callbacks)
+
+    def _notify(self) -> None:
+        # a burst of updates (eg the setup replies) only notifies listeners
+        # once, on the next turn of the event loop; with nobody listening
+        # (eg while the setup replies arrive) there is nothing to schedule
+        if self._notify_pending or not self._notification_snapshot:
+            return
+        self._notify_pending = True
+        asyncio.get_running_loop().call_soon(self._flush_notify)
+
+    def _flush_notify(self) -> None:
+        self._notify_pending = False
+        for callback in self._notification_snapshot:
             try:
                 callback()
-            except Exception as err:
-                # TIM. TODO. need to log the stack trace of the error found here, as at the moment v hard to find errors
-
-                _LOGGER.error(
-                    "Event callback caused an unhandled exception  (%s)",
-                    traceback.format_exc(),
-                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Event callback caused an unhandled exception")
 
     # Basics
 
@@ -174,44 +299,41 @@ class Receiver:
 
     # Volumes
 
-    def _volume_callback(self, param1: str, ignored: str) -> None:
-        self._volume = convert_decibel(param1)
-        self._notify_notification_callbacks()
-
-    def _zone_b_volume_callback(self, param1: str, ignored: str) -> None:
-        self._zone_b_volume = convert_decibel(param1)
-        self._notify_notification_callbacks()
+    _volume_callback = _decibel_callback("_volume")
+    _zone_b_volume_callback = _decibel_callback("_zone_b_volume")
 
     def _mute_on_callback(self, param1: str, param2: str):
         self._mute_enabled = True
-        self._notify_notification_callbacks()
+        self._notify()
 
     def _mute_off_callback(self, param1: str, param2: str):
         self._mute_enabled = False
-        self._notify_notification_callbacks()
+        self._notify()
 
     def _zone_b_mute_on_callback(self, param1: str, param2: str):
         self._zone_b_mute_enabled = True
-        self._notify_notification_callbacks()
+        self._notify()
 
     def _zone_b_mute_off_callback(self, param1: str, param2: str):
         self._zone_b_mute_enabled = False
-        self._notify_notification_callbacks()
+        self._notify()
 
     @property
     def volume(self):
-        return self._volume
+        return _decibels(self._volume)
 
     @volume.setter
     def volume(self, value):
+        _check_level("volume", value, -99.9, 10.0)
         self._api.volume(value)
 
     @property
     def zone_b_volume(self):
-        return self._zone_b_volume
+        return _decibels(self._zone_b_volume)
 
     @zone_b_volume.setter
     def zone_b_volume(self, value):
+        _check_level("zone_b_volume", value, -99.9, 10.0)
         self._api.zone_b_volume(value)
 
     def volume_up(self):
@@ -259,7 +381,7 @@ class Receiver:
     def _source_callback(self, param1: str, param2: str):
         if self._sources.is_full():
             self._source = param2
-            self._notify_notification_callbacks()
+            self._notify()
         else:
             self._sources.add(int(param1), param2)
 
@@ -284,7 +406,7 @@ class Receiver:
     def _zone_b_source_callback(self, param1: str, param2: str):
         if self._zone_b_sources.is_full():
             self._zone_b_source = param2
-            self._notify_notification_callbacks()
+            self._notify()
         else:
             self._zone_b_sources.add(int(param1), param2)
 
@@ -297,12 +419,13 @@ class Receiver:
         return self._audio_input
 
     def _audio_input_callback(self, param1: str, param2: str):
-        if int(param1) in self._audio_inputs:
-            self._audio_input = self._audio_inputs[int(param1)]
+        name = _lookup_id(self._audio_inputs, int(param1))
+        if name is not None:
+            self._audio_input = name
         else:
             self._audio_input =f'audio-{param1}'
-            _LOGGER.warning(f'audio_input({param1} is not known, so ignoring)')
-        self._notify_notification_callbacks()
+            _LOGGER.warning("audio_input(%s) is not known, so ignoring", param1)
+        self._notify()
 
 
     @property
@@ -310,24 +433,26 @@ class Receiver:
         return self._zone_b_audio_input
 
     def _zone_b_audio_input_callback(self, param1: str, param2: str):
-        if int(param1) in self._audio_inputs:
-            self._zone_b_audio_input = self._audio_inputs[int(param1)]
+        name = _lookup_id(self._audio_inputs, int(param1))
+        if name is not None:
+            self._zone_b_audio_input = name
         else:
             self._zone_b_audio_input =f'audio-{param1}'
-            _LOGGER.warning(f'zone_b_audio_input({param1}) is not known, so ignoring')
-        self._notify_notification_callbacks()
+            _LOGGER.warning("zone_b_audio_input(%s) is not known, so ignoring", param1)
+        self._notify()
 
     @property
     def video_input(self):
         return self._video_input
 
     def _video_input_callback(self, param1: str, param2: str):
-        if int(param1) in self._video_inputs:
-            self._video_input = self._video_inputs[int(param1)]
+        name = _lookup_id(self._video_inputs, int(param1))
+        if name is not None:
+            self._video_input = name
         else:
             self._video_input =f'video-{param1}'
-            _LOGGER.warning(f'zone_b_video_input({param1}) is not known, so ignoring')
-        self._notify_notification_callbacks()
+            _LOGGER.warning("video_input(%s) is not known, so ignoring", param1)
+        self._notify()
     
 
     @property
@@ -339,20 +464,22 @@ class Receiver:
         return self._zone_b_streaming_source
 
     def _stream_type_callback(self, param1: str, param2: str):
-        if int(param1) in self._stream_types:
-            self._streaming_source = self._stream_types[int(param1)]
+        name = _lookup_id(self._stream_types, int(param1))
+        if name is not None:
+            self._streaming_source = name
         else:
             self._streaming_source =f'video-{param1}'
-            _LOGGER.warning(f'stream_type({param1}) is not known, so ignoring')
-        self._notify_notification_callbacks()
+            _LOGGER.warning("stream_type(%s) is not known, so ignoring", param1)
+        self._notify()
 
     def _zone_b_stream_type_callback(self, param1: str, param2: str):
-        if int(param1) in self._stream_types:
-            self._zone_b_streaming_source = self._stream_types[int(param1)]
+        name = _lookup_id(self._stream_types, int(param1))
+        if name is not None:
+            self._zone_b_streaming_source = name
         else:
             self._zone_b_streaming_source =f'video-{param1}'
-            _LOGGER.warning(f'zone_b_stream_type({param1}) is not known, so ignoring')
-        self._notify_notification_callbacks()
+            _LOGGER.warning("zone_b_stream_type(%s) is not known, so ignoring", param1)
+        self._notify()
 
     @property
     def audio_information(self):
@@ -360,7 +487,7 @@ class Receiver:
 
     def _audio_info_callback(self, param1: str, param2: str):
         self._audio_info = param1
-        self._notify_notification_callbacks()
+        self._notify()
         
     @property
     def video_information(self):
@@ -368,7 +495,7 @@ class Receiver:
 
     def _video_info_callback(self, param1: str, param2: str):
         self._video_info = param1
-        self._notify_notification_callbacks()
+        self._notify()
 
     @property
     def sound_mode(self):
@@ -387,7 +514,7 @@ class Receiver:
     def _sound_mode_callback(self, param1: str, param2: str):
         if self._sound_modes.is_full():
             self._sound_mode = param2
-            self._notify_notification_callbacks()
+            self._notify()
         else:
             self._sound_modes.add(int(param1), param2)
 
@@ -396,12 +523,12 @@ class Receiver:
         return list(self._sound_modes.values())
 
     def _power_callback(self, param1: str, param2: str):
-        self._power_on = POWER_ON == param1
-        self._notify_notification_callbacks()
+        self._power_on = param1 == POWER_ON
+        self._notify()
 
     def _zone_b_power_callback(self, param1: str, param2: str):
-        self._zone_b_power_on = POWER_ON == param1
-        self._notify_notification_callbacks()
+        self._zone_b_power_on = param1 == POWER_ON
+        self._notify()
 
     @property
     def power_on(self):
@@ -423,7 +550,7 @@ class Receiver:
     def _room_perfect_position_callback(self, param1: str, param2: str):
         if self._room_perfect_positions.is_full():
             self._room_perfect_position = param2
-            self._notify_notification_callbacks()
+            self._notify()
         else:
             self._room_perfect_positions.add(int(param1), param2)
             
@@ -448,7 +575,7 @@ class Receiver:
     def _voicing_callback(self, param1: str, param2: str):
         if self._voicings.is_full():
             self._voicing = param2
-            self._notify_notification_callbacks()
+            self._notify()
         else:
             self._voicings.add(int(param1), param2)
     
@@ -472,7 +599,7 @@ class Receiver:
       
     def _lipsync_callback(self, param1: str, param2: str):
         self._lipsync=int(param1)
-        self._notify_notification_callbacks()
+        self._notify()
         
     @property
     def lipsync(self):
@@ -483,128 +610,66 @@ class Receiver:
         self._api.change_lipsync(lipsync)
         
     # trims
-    def _trim_bass_callback(self, param1: str, ignored: str) -> None:
-        self._trim_bass = convert_decibel(param1)
-        self._notify_notification_callbacks()
-        
-    @property
-    def trim_bass(self):
-        return self._trim_bass
-    
-    @trim_bass.setter
-    def trim_bass(self, trim: float):
-        self._api.change_trim_bass(trim)
-        
-    def trim_bass_up(self):
-        self._api.trim_bass_up()
-
-    def trim_bass_down(self):
-        self._api.trim_bass_down()
+    _trim_bass_callback = _decibel_callback("_trim_bass")
+    trim_bass = _trim_property("bass", -12.0, 12.0)
+    trim_bass_up = _api_call("trim_bass_up")
+    trim_bass_down = _api_call("trim_bass_down")
+
+    _trim_centre_callback = _decibel_callback("_trim_centre")
+    trim_centre = _trim_property("centre", -10.0, 10.0)
+    trim_centre_up = _api_call("trim_centre_up")
+    trim_centre_down = _api_call("trim_centre_down")
+
+    _trim_height_callback = _decibel_callback("_trim_height")
+    trim_height = _trim_property("height", -10.0, 10.0)
+    trim_height_up = _api_call("trim_height_up")
+    trim_height_down = _api_call("trim_height_down")
+
+    _trim_lfe_callback = _decibel_callback("_trim_lfe")
+    trim_lfe = _trim_property("lfe", -10.0, 10.0)
+    trim_lfe_up = _api_call("trim_lfe_up")
+    trim_lfe_down = _api_call("trim_lfe_down")
+
+    _trim_surround_callback = _decibel_callback("_trim_surround")
+    trim_surround = _trim_property("surround", -10.0, 10.0)
+    trim_surround_up = _api_call("trim_surround_up")
+    trim_surround_down = _api_call("trim_surround_down")
+
+    _trim_treble_callback = _decibel_callback("_trim_treble")
+    trim_treble = _trim_property("treble", -12.0, 12.0)
+    trim_treble_up = _api_call("trim_treble_up")
+    trim_treble_down = _api_call("trim_treble_down")
         
-    def _trim_centre_callback(self, param1: str, ignored: str) -> None:
-        self._trim_centre = convert_decibel(param1)
-        self._notify_notification_callbacks()
         
-    @property
-    def trim_centre(self):
-        return self._trim_centre
-    
-    @trim_centre.setter
-    def trim_centre(self, trim: float):
-        self._api.change_trim_centre(trim)
         
-    def trim_centre_up(self):
-        self._api.trim_centre_up()
-
-    def trim_centre_down(self):
-        self._api.trim_centre_down()
-    
-    def _trim_height_callback(self, param1: str, ignored: str) -> None:
-        self._trim_height = convert_decibel(param1)
-        self._notify_notification_callbacks()
-        
-    @property
-    def trim_height(self):
-        return self._trim_height
-    
-    @trim_height.setter
-    def trim_height(self, trim: float):
-        self._api.change_trim_height(trim)
         
-    def trim_height_up(self):
-        self._api.trim_height_up()
+from .const import MP60_AUDIO_INPUTS_TBL, MP60_VIDEO_INPUTS_TBL, MP60_STREAM_TYPES_TBL
+class MP60Receiver(Receiver):
 
-    def trim_height_down(self):
-        self._api.trim_height_down()
-        
-    def _trim_lfe_callback(self, param1: str, ignored: str) -> None:
-        self._trim_lfe = convert_decibel(param1)
-        self._notify_notification_callbacks()
-        
-    @property
-    def trim_lfe(self):
-        return self._trim_lfe
-    
-    @trim_lfe.setter
-    def trim_lfe(self, trim: float):
-        self._api.change_trim_lfe(trim)
-        
-    def trim_lfe_up(self):
-        self._api.trim_lfe_up()
+    __slots__ = ()
 
-    def trim_lfe_down(self):
-        self._api.trim_lfe_down()
-            
-    def _trim_surround_callback(self, param1: str, ignored: str) -> None:
-        self._trim_surround = convert_decibel(param1)
-        self._notify_notification_callbacks()
-        
-    @property
-    def trim_surround(self):
-        return self._trim_surround
-    
-    @trim_surround.setter
-    def trim_surround(self, trim: float):
-        self._api.change_trim_surround(trim)
-        
-    def trim_surround_up(self):
-        self._api.trim_surround_up()
-
-    def trim_surround_down(self):
-        self._api.trim_surround_down()
-        
-    def _trim_treble_callback(self, param1: str, ignored: str) -> None:
-        self._trim_treble = convert_decibel(param1)
-        self._notify_notification_callbacks()
-        
-    @property
-    def trim_treble(self):
-        return self._trim_treble
-    
-    @trim_treble.setter
-    def trim_treble(self, trim: float):
-        self._api.change_trim_treble(trim)
-        
-    def trim_treble_up(self):
-        self._api.trim_treble_up()
-
-    def trim_treble_down(self):
-        self._api.trim_treble_down()
-        
-        
-        
-        
-from .const import MP60_AUDIO_INPUTS, MP60_VIDEO_INPUTS, MP60_STREAM_TYPES       
-class MP60Receiver(Receiver):
+    _stream_types = MP60_STREAM_TYPES_TBL
+    _audio_inputs = MP60_AUDIO_INPUTS_TBL
+    _video_inputs = MP60_VIDEO_INPUTS_TBL
 
     def __init__(self, host: str):
         """Initialize the client."""
-        self._audio_inputs=MP60_AUDIO_INPUTS
-        self._video_inputs=MP60_VIDEO_INPUTS
-        self._stream_types=MP60_STREAM_TYPES
         super().__init__(host, LyngdorfModel.MP_60)
-    
+
+
+_RECEIVER_CTORS: Dict[LyngdorfModel, Callable[[str], Receiver]] = {
+    LyngdorfModel.MP_60: MP60Receiver,
+}
+
+def _construct_receiver(host: str, model: LyngdorfModel) -> Receiver:
+    ctor = _RECEIVER_CTORS.get(model)
+    if ctor is None:
+        raise NotImplementedError("Unknown Receiver")
+    return ctor(host)
+
 def create_receiver(host: str, model: LyngdorfModel=None, ) -> Receiver: 
+    if not host:
+        raise ValueError("host required")
     if not (model):
         try:
             model = find_receiver_model(host)
@@ -612,43 +677,95 @@ def create_receiver(host: str, model: LyngdorfModel=None, ) -> Receiver:
             return None
         if not (model):
             raise NotImplementedError("Unknown Receiver")    
-    if (model == LyngdorfModel.MP_60):
-        return MP60Receiver(host)
-    raise NotImplementedError("Unknown Receiver")
+    return _construct_receiver(host, model)
+
+async def async_create_receiver(host: str, model: LyngdorfModel=None) -> Receiver:
+    """As create_receiver, but probes for the model without blocking the event loop."""
+    if not host:
+        raise ValueError("host required")
+    if not (model):
+        model = await async_find_receiver_model(host)
+        if not (model):
+            raise NotImplementedError("Unknown Receiver")
+    return _construct_receiver(host, model)
+
+def _recv_line(sock: socket.socket, deadline: float) -> bytes:
+    """Read up to the first \r from sock, rather than waiting on a fixed byte count."""
+    buf = bytearray(_MAX_PROBE_REPLY)
+    view = memoryview(buf)
+    size = 0
+    while size < _MAX_PROBE_REPLY:
+        sock.settimeout(max(deadline - time.monotonic(), 0.001))
+        nbytes = sock.recv_into(view[size:])
+        if not nbytes:
+            break
+        end = buf.find(b"\r", size, size + nbytes)
+        if end >= 0:
+            return bytes(buf[:end])
+        size += nbytes
+    return bytes(buf[:size])
 
 def find_receiver_model(host: str) -> LyngdorfModel: 
-    sock: socket=None
+    deadline = time.monotonic() + DISCOVERY_TIMEOUT
     try:
-        modelName:str=None
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect((host, DEFAULT_LYNGDORF_PORT))
-        sock.sendall("!DEVICE?\r".encode("utf-8"))
-        buf=sock.recv(20)
-        message=buf.decode("utf-8")
-        try:
-            sock.close()
-        except:
-            pass
-        message = message[1:]
-        if 1 < message.find("(") < message.find(")"):
-            cmd = message[: message.find("(")]
-            modelName = message[1 + message.find("(") : message.find(")")]
-            model: LyngdorfModel=lookup_receiver_model(modelName)
-            if (model):
-                return model
-            _LOGGER.warn(f'model {modelName} receiver found at {host}, but we cannot use it as it is not implemented')
+        # the receiver only serves one client at a time, so never leave the probe socket open
+        with socket.create_connection((host, DEFAULT_LYNGDORF_PORT), timeout=DISCOVERY_TIMEOUT) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(b"!DEVICE?\r")
+            buf = _recv_line(sock, deadline)
     except socket.error as exc:
-        _LOGGER.warn(f'Attempting to connect with {host}, but we we failed {exc}')
-        if (sock):
-            try:
-                sock.close()
-            except:
-                pass
+        _LOGGER.warning("Attempting to connect with %s, but we failed %s", host, exc)
+        return None
+    return _parse_model_reply(host, buf)
+
+async def async_find_receiver_model(host: str) -> LyngdorfModel:
+    """As find_receiver_model, but without blocking the event loop."""
+    writer = None
+    try:
+        async with asyncio_timeout(DISCOVERY_TIMEOUT):
+            reader, writer = await asyncio.open_connection(host, DEFAULT_LYNGDORF_PORT)
+            writer.write(b"!DEVICE?\r")
+            buf = await reader.readuntil(b"\r")
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+        _LOGGER.warning("Attempting to connect with %s, but we failed %r", host, exc)
         return None
+    finally:
+        # the receiver only serves one client at a time, so make sure the probe
+        # socket is gone before anyone goes on to connect
+        if writer is not None:
+            writer.close()
+            with suppress(OSError):
+                await writer.wait_closed()
+    return _parse_model_reply(host, buf[:-1])
+
+async def find_receivers(hosts: Iterable[str]) -> Dict[str, LyngdorfModel]:
+    """Probe several hosts at once, returning the model of each one that answered as a known receiver."""
+    hosts = list(hosts)
+    # the probes run concurrently, so this takes as long as the slowest host rather than all of them
+    models = await asyncio.gather(
+        *(async_find_receiver_model(host) for host in hosts), return_exceptions=True
+    )
+    return {
+        host: model
+        for host, model in zip(hosts, models)
+        if isinstance(model, LyngdorfModel)
+    }
+
+def _parse_model_reply(host: str, buf: bytes) -> LyngdorfModel:
+    # !DEVICE(MP-60); only the bracketed model name is needed
+    open_pos = buf.find(b"(")
+    close_pos = buf.find(b")", open_pos + 1)
+    if 1 < open_pos < close_pos:
+        modelName = buf[open_pos + 1 : close_pos].decode("ascii", "replace")
+        model: LyngdorfModel=lookup_receiver_model(modelName)
+        if (model):
+            return model
+        _LOGGER.warning(
+            "model %s receiver found at %s, but we cannot use it as it is not implemented",
+            modelName,
+            host,
+        )
     return None
 
 def lookup_receiver_model(modelName: str) -> LyngdorfModel:  
-    for model in LyngdorfModel:
-        if (model.model.casefold() == modelName.casefold()):
-            return model
-    return None
\ No newline at end of file
+    return LyngdorfModel.from_model_string(modelName)
@@ -1,9 +1,18 @@
 import asyncio
+import contextlib
 import logging
 import pytest
+import socket
+from unittest import mock
 
 from lyngdorf.base import CountingNumberDict
-from lyngdorf.device import find_receiver_model
+from lyngdorf.const import LyngdorfModel, MP60_AUDIO_INPUTS_TBL, MP60_SETUP_MESSAGES
+from lyngdorf.device import (
+    _lookup_id,
+    async_find_receiver_model,
+    convert_decibel,
+    find_receivers,
+)
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -22,6 +31,89 @@ def test_counting_dictionary_test():
     assert "zero,one,two" == ",".join(cd.values())
 
     _LOGGER.debug("nothng to see here")
+
+
+def test_counting_dictionary_reverse_lookup():
+    cd: CountingNumberDict = CountingNumberDict(3)
+
+    cd.add(0, "zero")
+    cd.add(1, "one")
+    cd.add(2, "one")
+    assert 1 == cd.lookupIndex("one")
+
+    cd.add(1, "uno")
+    assert 2 == cd.lookupIndex("one")
+    assert 1 == cd.lookupIndex("uno")
+
+    del cd[0]
+    assert -1 == cd.lookupIndex("zero")
+    assert "one" == cd.pop(2)
+    assert -1 == cd.lookupIndex("one")
+
+    cd.count_callback("2", "")
+    assert -1 == cd.lookupIndex("uno")
+    assert not cd
     
 # def test_model():
 #     model=find_receiver_model("192.168.16.16")
+
+
+def test_id_tables():
+    assert "HDMI" == _lookup_id(MP60_AUDIO_INPUTS_TBL, 1)
+    assert "airable" == _lookup_id(MP60_AUDIO_INPUTS_TBL, 42)
+    # gaps in the ids, and ids either side of the table
+    assert _lookup_id(MP60_AUDIO_INPUTS_TBL, 2) is None
+    assert _lookup_id(MP60_AUDIO_INPUTS_TBL, 43) is None
+    assert _lookup_id(MP60_AUDIO_INPUTS_TBL, -1) is None
+
+
+def test_setup_messages_are_separate_commands():
+    # a missing comma once glued two of these into "LIPSYNC?ZSTREAMTYPE?"
+    assert all(s.endswith("?") or s.endswith(")") for s in MP60_SETUP_MESSAGES)
+    assert all(s.count("?") <= 1 for s in MP60_SETUP_MESSAGES)
+    assert "LIPSYNC?" in MP60_SETUP_MESSAGES
+    assert "ZSTREAMTYPE?" in MP60_SETUP_MESSAGES
+
+
+def test_convert_decibel():
+    assert -28.1 == convert_decibel("-281")
+    assert 0.3 == convert_decibel("3")
+    assert 0.0 == convert_decibel("0")
+
+
+@contextlib.asynccontextmanager
+async def _probe_server():
+    """Serve a DEVICE? probe as an MP-60 on a free local port, patched in as the receiver port."""
+
+    async def serve(reader, writer):
+        assert b"!DEVICE?\r" == await reader.readuntil(b"\r")
+        writer.write(b"!DEVICE(MP-60)\r")
+        await writer.drain()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        with mock.patch("lyngdorf.device.DEFAULT_LYNGDORF_PORT", port):
+            yield
+
+
+def _closed_port() -> int:
+    """Return a local port that was free a moment ago, so connecting to it is refused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_async_find_receiver_model():
+    async with _probe_server():
+        assert LyngdorfModel.MP_60 == await async_find_receiver_model("127.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_find_receivers():
+    async with _probe_server():
+        assert {"127.0.0.1": LyngdorfModel.MP_60} == await find_receivers(["127.0.0.1"])
+    # a host that refuses the probe is left out
+    with mock.patch("lyngdorf.device.DEFAULT_LYNGDORF_PORT", _closed_port()):
+        assert {} == await find_receivers(["127.0.0.1"])
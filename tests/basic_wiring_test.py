@@ -4,9 +4,10 @@ import pytest
 from unittest import mock
 from unittest.mock import create_autospec
 
-from lyngdorf.const import LyngdorfModel, Msg
+from lyngdorf.const import LyngdorfModel, Msg, MAX_MESSAGE_SIZE
 from lyngdorf.api import LyngdorfProtocol
 from lyngdorf.device import Receiver, create_receiver
+from lyngdorf.exceptions import LyngdorfInvalidValueError
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -90,6 +91,28 @@ class TestMainFunctions:
         l= f'{mp60.lookup_command(Msg.PONG)}'
         assert l=="PONG"   
 
+    def test_protocol_framing(self):
+        # frames split across reads, and a line longer than the receive buffer
+        received = []
+        protocol = LyngdorfProtocol(received.append, None)
+        protocol.data_received(b"!VOL(-2")
+        protocol.data_received(b"81)\r!MUTEON\r!AUD")
+        protocol.data_received(b"TYPE(" + b"x" * 70000 + b")\r")
+        assert received[:2] == [b"!VOL(-281)", b"!MUTEON"]
+        assert received[2] == b"!AUDTYPE(" + b"x" * 70000 + b")"
+        # a runaway line is dropped without taking the next message with it
+        protocol.data_received(b"!AUDTYPE(" + b"x" * (MAX_MESSAGE_SIZE * 2))
+        protocol.data_received(b")\r!MUTEOFF\r")
+        assert received[3:] == [b"!MUTEOFF"]
+
+    def test_protocol_framing_with_stdlib_feeder(self):
+        # the stdlib feeder keeps each get_buffer() slice alive while the buffer grows
+        received = []
+        protocol = LyngdorfProtocol(received.append, None)
+        feed = asyncio.protocols._feed_data_to_buffered_proto
+        feed(protocol, b"!AUDTYPE(" + b"x" * 70000 + b")\r!MUTEON\r")
+        assert received == [b"!AUDTYPE(" + b"x" * 70000 + b")", b"!MUTEON"]
+
     def test_logging(self):
         _LOGGER.debug("Hello from debug logging")
 
@@ -98,6 +121,12 @@ class TestMainFunctions:
         assert client0.model.model=="mp-60"
         assert client0.model.manufacturer=="Lyngdorf"
         assert client0.model.name=="MP_60"
+        assert client0.model.lookup_msg("ZVOL") == Msg.ZONE_B_VOLUME
+        assert client0.model.lookup_msg("NOSUCHCOMMAND") is None
+        assert LyngdorfModel.from_model_string("MP-60") is LyngdorfModel.MP_60
+        assert LyngdorfModel.from_model_string("mp-99") is None
+        with pytest.raises(ValueError):
+            create_receiver("", LyngdorfModel.MP_60)
         
 
     @pytest.mark.asyncio
@@ -147,6 +176,13 @@ class TestMainFunctions:
             client.trim_lfe=-2.0
             client.trim_surround=5.0
             client.trim_treble=6.0
+            # out of range levels are refused before anything is sent
+            with pytest.raises(LyngdorfInvalidValueError):
+                client.trim_bass=12.0
+            with pytest.raises(LyngdorfInvalidValueError):
+                client.trim_lfe=-10.5
+            with pytest.raises(LyngdorfInvalidValueError):
+                client.volume=10.0
             
             client.trim_bass_up()
             client.trim_bass_down()
@@ -178,6 +214,28 @@ class TestMainFunctions:
             None,
         )
     
+    @pytest.mark.asyncio
+    async def test_receiving_trims(self):
+        def test_function(client: Receiver):
+            assert client.trim_bass == -2.0
+            assert client.trim_centre == 1.5
+            assert client.trim_height == -0.5
+            assert client.trim_lfe == 0.3
+            assert client.trim_surround == 10.0
+
+        await self._test_receiving_commands(
+            [
+                "!TRIMBASS(-20)",
+                "!TRIMCENTER(15)",
+                "!TRIMHEIGHT(-5)",
+                "!TRIMLFE(3)",
+                "!TRIMSURRS(100)",
+                "!AUDTYPE(PCM zero, 2.0.0)",
+            ],
+            "AUDTYPE",
+            test_function,
+        )
+
     @pytest.mark.asyncio
     async def test_power_off(self):
         # make sure POWER(0) turns the API off
@@ -220,6 +278,7 @@ class TestMainFunctions:
 
         def client_functions(client: Receiver):
             client.volume = -22
+            client.zone_b_volume = -30
             client.volume_up()
             client.volume_down()
             client.zone_b_volume_up()
@@ -236,6 +295,7 @@ class TestMainFunctions:
             _LOGGER.debug(",".join(commandsSent))
             assert [
                 "!VOL(-220)",
+                "!ZVOL(-300)",
                 "!VOL+",
                 "!VOL-",
                 "!ZVOL+",
@@ -249,9 +309,10 @@ class TestMainFunctions:
                 "!RPVOI(1)"
             ] == commandsSent
 
+        # the receiver must have listed its positions and voicings first
         await self._test_sending_commands(
-            ["!AUDTYPE(PCM zero, 2.0.0)"],
-            "AUDTYPE",
+            SETUP_RESPONSES,
+            SETUP_LAST_RESPONSE,
             client_functions,
             assertion_function,
         )
@@ -266,7 +327,8 @@ class TestMainFunctions:
         notify_me.counter = 0
 
         def test_function(client: Receiver):
-            assert notify_me.counter == 17
+            # the 17 updates in the setup burst are coalesced into one notification
+            assert notify_me.counter == 1
 
         def before_connect_function(client: Receiver):
             client.register_notification_callback(notify_me)
@@ -338,15 +400,19 @@ class TestMainFunctions:
         if before_connect_function is not None:
             before_connect_function(client)
 
-        with mock.patch("asyncio.get_event_loop", new_callable=mock.Mock) as debug_mock:
-            debug_mock.return_value.create_connection = AsyncMock(
-                side_effect=create_conn
-            )
+        # only the connection is faked; the rest of the loop is real
+        with mock.patch.object(
+            asyncio.get_running_loop(),
+            "create_connection",
+            new=AsyncMock(side_effect=create_conn),
+        ):
             await client.async_connect()
             self.future = asyncio.Future()
             client._api.register_callback(wait_for_command, self._callback)
             protocol.data_received(bytes("\r".join(commands_received) + "\r", "utf-8"))
             await self.future
+            # let any notification tasks scheduled by the callbacks run
+            await asyncio.sleep(0)
             test_function(client)
             await client.async_disconnect()
 
@@ -381,13 +447,14 @@ class TestMainFunctions:
         # # pylint: disable=protected-access
         # write_function=create_autospec(client._api._protocol.write, return_value=None)
 
-        with mock.patch("asyncio.get_event_loop", new_callable=mock.Mock) as debug_mock:
+        with mock.patch.object(
+            asyncio.get_running_loop(),
+            "create_connection",
+            new=AsyncMock(side_effect=create_conn),
+        ):
             with mock.patch(
                 "lyngdorf.api.LyngdorfProtocol.write", new_callable=mock.Mock
             ) as write_mock:
-                debug_mock.return_value.create_connection = AsyncMock(
-                    side_effect=create_conn
-                )
                 await client.async_connect()
                 self.future = asyncio.Future()
                 client._api.register_callback(wait_for_command, self._callback)
@@ -402,7 +469,7 @@ class TestMainFunctions:
 
                 after_list = list(
                     map(
-                        lambda call: call.args[0].replace("\r", ""),
+                        lambda call: call.args[0].decode("utf-8").replace("\r", ""),
                         write_mock.call_args_list[before_length:],
                     )
                 )